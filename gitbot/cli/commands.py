@@ -4,7 +4,6 @@ GitBot CLI entry point — Click commands.
 
 import asyncio
 import click
-from gitbot.onboarding.wizard import run_onboarding
 
 
 @click.group()
@@ -16,6 +15,8 @@ def cli():
 @cli.command()
 def onboard():
     """Run the onboarding wizard to configure GitBot."""
+    from gitbot.onboarding.wizard import run_onboarding
+
     run_onboarding()
 
 
@@ -54,6 +55,7 @@ def config():
     )
     table.add_row("LLM Provider", cfg.get("llm_provider", ""))
     table.add_row("LLM Model", cfg.get("llm_model", ""))
+    table.add_row("Max Tokens", str(cfg.get("llm_max_tokens", 2048)))
     table.add_row(
         "Groq API Key",
         "••••" + cfg.get("groq_api_key", "")[-4:] if cfg.get("groq_api_key") else "N/A",
@@ -3,25 +3,51 @@ GitBot agent loop — ties together LLM, MCP, and terminal UI.
 """
 
 import asyncio
-import json
 
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, SystemMessage
-
-from gitbot.core.config import load_config, load_memory, save_memory, is_onboarded
+import orjson
+from langchain_core.messages import (
+    HumanMessage,
+    AIMessage,
+    ToolMessage,
+    SystemMessage,
+    message_chunk_to_message,
+)
+from rich.text import Text
+
+from gitbot.core.config import (
+    TRUNCATION_MARKER,
+    load_config,
+    MemMsg,
+    load_memory,
+    append_memory,
+    save_memory,
+    is_onboarded,
+)
+from gitbot.core.runtime import install_executor
 from gitbot.llm.providers import get_llm
-from gitbot.mcp.client import connect_mcp, mcp_tools_to_langchain, call_mcp_tool
-from gitbot.tools.git_tools import get_git_tools
+from gitbot.mcp.client import (
+    MAX_TOOL_RESULT,
+    MCP_RETRIEVE_TOOL,
+    MCPToolIndex,
+    clear_mcp_cache,
+    load_langchain_tools,
+    mcp_sessions,
+)
+from gitbot.tools.git_tools import READ_ONLY_GIT_TOOLS, get_git_tools
 from gitbot.ui.console import (
     console,
     print_banner,
     print_tool_call,
     print_tool_result,
-    print_response,
     print_thinking,
     print_error,
     print_welcome_back,
+    stream_response,
 )
 
+# Number of messages kept in the LLM context window; older turns fall off.
+MEMORY_LIMIT = 50
+
 SYSTEM_PROMPT = """You are GitBot, an AI assistant that helps users interact with Git and GitHub using natural language.
 
 The current user's GitHub details:
@@ -41,32 +67,85 @@ Guidelines:
 - Be helpful, concise, and accurate.
 - When using tools, explain what you're doing.
 - Always use the user's GitHub username from above — never ask for it.
+- GitHub tools are loaded on demand: call `mcp_retrieve` with keywords for the task first, then use the tools it returns.
 - Format output nicely using markdown.
 - If a tool call fails, explain the error and suggest alternatives.
 - Always confirm destructive actions (delete, force-push, etc.) before proceeding.
 """
 
 
-def _serialize_messages(messages) -> list[dict]:
-    """Convert LangChain messages to serializable dicts for persistence."""
-    serialized = []
-    for msg in messages:
-        if isinstance(msg, SystemMessage):
+def _to_memory(msg) -> MemMsg:
+    """Capture a LangChain message as a persistable memory record."""
+    tool_calls = None
+    if getattr(msg, "tool_calls", None):
+        tool_calls = [
+            {"name": tc["name"], "args": tc["args"], "id": tc["id"]}
+            for tc in msg.tool_calls
+        ]
+    return MemMsg(
+        type=msg.type,
+        content=msg.content,
+        tool_calls=tool_calls,
+        tool_call_id=getattr(msg, "tool_call_id", None) or None,
+    )
+
+
+def _window_start(types: list[str], limit: int) -> int:
+    """
+    Index to trim the conversation from so that about `limit` messages stay.
+
+    Cuts only right before a human message, where a turn starts, so a tool
+    call is never separated from its results. A single turn longer than the
+    limit is kept whole.
+    """
+    first = max(len(types) - limit, 0)
+    if first == 0:
+        return 0
+    for i in range(first, len(types)):
+        if types[i] == "human":
+            return i
+    for i in range(first - 1, -1, -1):
+        if types[i] == "human":
+            return i
+    return first
+
+
+def _drop_unanswered_tool_calls(messages: list) -> list:
+    """
+    Remove tool calls without all their results, and results without a call.
+
+    Providers reject a history where an assistant tool call is not followed
+    by a response for each call id, e.g. after a session was killed mid-tool.
+    """
+    kept = []
+    i = 0
+    while i < len(messages):
+        msg = messages[i]
+        if isinstance(msg, ToolMessage):
+            i += 1  # Orphaned: its call was dropped or never persisted.
+            continue
+        if isinstance(msg, AIMessage) and msg.tool_calls:
+            j = i + 1
+            while j < len(messages) and isinstance(messages[j], ToolMessage):
+                j += 1
+            answered = {m.tool_call_id for m in messages[i + 1 : j]}
+            if all(tc["id"] in answered for tc in msg.tool_calls):
+                kept.extend(messages[i:j])
+            i = j
             continue
-        entry = {"type": msg.type, "content": msg.content}
-        if hasattr(msg, "tool_calls") and msg.tool_calls:
-            entry["tool_calls"] = [
-                {"name": tc["name"], "args": tc["args"], "id": tc["id"]}
-                for tc in msg.tool_calls
-            ]
-        if hasattr(msg, "tool_call_id") and msg.tool_call_id:
-            entry["tool_call_id"] = msg.tool_call_id
-        serialized.append(entry)
-    return serialized
+        kept.append(msg)
+        i += 1
+    return kept
 
 
 def _deserialize_messages(data: list[dict]) -> list:
-    """Convert persisted dicts back to LangChain messages."""
+    """
+    Convert persisted dicts back to LangChain messages, dropping any tool
+    calls left without results.
+    """
+    # The validating constructors are used on purpose: with pydantic v2's
+    # compiled validators they are several times faster than model_construct,
+    # which fills defaults in pure Python.
     messages = []
     for entry in data:
         msg_type = entry.get("type", "")
@@ -75,20 +154,193 @@ def _deserialize_messages(data: list[dict]) -> list:
         if msg_type == "human":
             messages.append(HumanMessage(content=content))
         elif msg_type == "ai":
-            tool_calls = entry.get("tool_calls", [])
+            tool_calls = entry.get("tool_calls") or []
             messages.append(AIMessage(content=content, tool_calls=tool_calls))
         elif msg_type == "tool":
             messages.append(
-                ToolMessage(content=content, tool_call_id=entry.get("tool_call_id", ""))
+                ToolMessage(
+                    content=content, tool_call_id=entry.get("tool_call_id") or ""
+                )
             )
-    return messages
+    return _drop_unanswered_tool_calls(messages)
+
+
+class _ToolRunner:
+    """
+    Runs the tool calls of one LLM reply, starting each as soon as it is known.
+
+    MCP calls fan out in parallel. Local git tools share one working tree,
+    so each mutating tool waits for every local tool issued before it, and
+    read-only ones (status, log) wait only for the last mutating tool —
+    so reads run concurrently but still see earlier writes.
+    mcp_retrieve calls are answered locally from the tool index.
+    """
+
+    def __init__(self, local_tool_map: dict, tool_index: MCPToolIndex):
+        self._local_tool_map = local_tool_map
+        self._tool_index = tool_index
+        self._last_write: asyncio.Task | None = None
+        self._reads: list[asyncio.Task] = []
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def _run(self, name: str, args: dict, after: list) -> str:
+        if name == MCP_RETRIEVE_TOOL["name"]:
+            return self._tool_index.retrieve(args.get("keywords", []))
+        if name not in self._local_tool_map:
+            return await mcp_sessions.call_tool(name, args)
+
+        if after:
+            await asyncio.wait(after)
+        result = await self._local_tool_map[name].ainvoke(args)
+        if len(result) > MAX_TOOL_RESULT:
+            result = result[:MAX_TOOL_RESULT] + TRUNCATION_MARKER
+        return result
+
+    def start(self, tool_call: dict) -> asyncio.Task:
+        """Schedule a tool call unless it is already running."""
+        tool_id = tool_call["id"]
+        task = self._tasks.get(tool_id) if tool_id else None
+        if task is None:
+            name = tool_call["name"]
+            after = self._local_order(name)
+            task = asyncio.create_task(self._run(name, tool_call["args"], after))
+            if name in self._local_tool_map:
+                if name in READ_ONLY_GIT_TOOLS:
+                    self._reads.append(task)
+                else:
+                    self._last_write, self._reads = task, []
+            if tool_id:
+                self._tasks[tool_id] = task
+        return task
+
+    def _local_order(self, name: str) -> list:
+        """Earlier local tool runs a new call to `name` must wait for."""
+        if name not in self._local_tool_map:
+            return []
+        after = [self._last_write] if self._last_write else []
+        if name not in READ_ONLY_GIT_TOOLS:
+            after += self._reads
+        return after
+
+    async def results(self, tool_calls: list) -> list:
+        """
+        Start any calls not yet running and wait for all of them.
+        Results (or raised exceptions) come back in call order.
+        """
+        tasks = [self.start(tool_call) for tool_call in tool_calls]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _completed_tool_calls(response) -> list[dict]:
+    """Tool calls in a partially streamed reply whose arguments are complete."""
+    completed = []
+    for chunk in response.tool_call_chunks:
+        if not (chunk.get("id") and chunk.get("name") and chunk.get("args")):
+            continue
+        try:
+            args = orjson.loads(chunk["args"])
+        except orjson.JSONDecodeError:
+            continue  # Still streaming.
+        if isinstance(args, dict):
+            completed.append({"name": chunk["name"], "args": args, "id": chunk["id"]})
+    return completed
+
+
+async def _stream_llm(llm_with_tools, full_messages, on_tool_call=None) -> AIMessage:
+    """
+    Stream one LLM reply, rendering its text as it arrives.
+
+    on_tool_call, if given, is called with each tool call as soon as its
+    arguments have fully streamed, so tools can run while the model is
+    still generating the rest of the reply.
+    """
+    response = None
+    seen = set()
+    with stream_response() as render:
+        async for chunk in llm_with_tools.astream(full_messages):
+            response = chunk if response is None else response + chunk
+            if chunk.content:
+                render(response.text)
+            if on_tool_call and chunk.tool_call_chunks:
+                for tool_call in _completed_tool_calls(response):
+                    if tool_call["id"] not in seen:
+                        seen.add(tool_call["id"])
+                        on_tool_call(tool_call)
+
+    if response is None:
+        return AIMessage(content="")
+    return message_chunk_to_message(response)
+
+
+async def _run_turn(
+    llm,
+    base_tools: list,
+    base_llm_with_tools,
+    system_msg: SystemMessage,
+    messages: list,
+    remember,
+    local_tool_map: dict,
+    tool_index: MCPToolIndex,
+):
+    """
+    Answer the latest user message, running tool rounds until the LLM replies
+    without tool calls. Every message produced is passed to remember().
+    """
+    tool_index.reset()
+    llm_with_tools = base_llm_with_tools
+    # Number of retrieved GitHub tools llm_with_tools is bound with. Compared
+    # after each round rather than snapshotted around it, since mcp_retrieve
+    # may already have run while the reply was streaming.
+    bound = 0
+
+    full_messages = [system_msg, *messages]
+    runner = _ToolRunner(local_tool_map, tool_index)
+    response = await _stream_llm(llm_with_tools, full_messages, runner.start)
+
+    while response.tool_calls:
+        tool_messages = []
+        with print_thinking():
+            results = await runner.results(response.tool_calls)
+        if len(tool_index.selected) != bound:
+            llm_with_tools = llm.bind_tools(
+                base_tools + list(tool_index.selected.values())
+            )
+            bound = len(tool_index.selected)
+
+        for tool_call, result in zip(response.tool_calls, results):
+            tool_name = tool_call["name"]
+            tool_id = tool_call["id"]
+
+            with console.buffered():
+                print_tool_call(tool_name, tool_call["args"])
+
+                if isinstance(result, BaseException):
+                    result = f"Error calling tool '{tool_name}': {result}"
+                    print_error(result)
+                else:
+                    print_tool_result(result)
+
+            tool_messages.append(ToolMessage(content=result, tool_call_id=tool_id))
+
+        remember(response, *tool_messages)
+        full_messages = [system_msg, *messages]
+        runner = _ToolRunner(local_tool_map, tool_index)
+        response = await _stream_llm(llm_with_tools, full_messages, runner.start)
+
+    remember(response)
 
 
 async def run_agent_loop():
     """Main agent loop — connect MCP, bind tools, and chat."""
 
+    install_executor()
+
     if not is_onboarded():
-        print_error("You haven't onboarded yet! Run [bold]gitbot onboard[/bold] first.")
+        print_error(
+            Text.assemble(
+                "You haven't onboarded yet! Run ", ("gitbot onboard", "bold"), " first."
+            )
+        )
         return
 
     config = load_config()
@@ -105,98 +357,91 @@ async def run_agent_loop():
     console.print("[muted]  Connecting to GitHub MCP server…[/muted]")
 
     try:
-        async with connect_mcp(config["github_token"]) as (session, mcp_tools):
-            console.print(
-                f"  [success]✔[/success]  Connected! [muted]{len(mcp_tools)} tools available.[/muted]\n"
+        _, mcp_tools = await mcp_sessions.get_or_create(config["github_token"])
+        console.print(
+            f"  [success]✔[/success]  Connected! [muted]{len(mcp_tools)} tools available.[/muted]\n"
+        )
+        console.rule(style="cyan")
+        console.print()
+
+        tool_index = MCPToolIndex(load_langchain_tools(mcp_tools))
+        local_tools = get_git_tools()
+        local_tool_map = {t.name: t for t in local_tools}
+
+        # Only local tools and the retriever are bound up front; GitHub
+        # tools are bound for the turns that retrieve them.
+        base_tools = local_tools + [MCP_RETRIEVE_TOOL]
+        base_llm_with_tools = llm.bind_tools(base_tools)
+
+        raw_memory = list(load_memory())
+        start = _window_start([e.get("type", "") for e in raw_memory], MEMORY_LIMIT)
+        messages = _deserialize_messages(raw_memory[start:])
+        # Persisted form of the same window, so compaction never re-walks
+        # the LangChain messages.
+        mem_log = [_to_memory(msg) for msg in messages]
+        logged = len(raw_memory)
+
+        def remember(*msgs):
+            """
+            Add messages to the conversation and append them to disk together.
+            A tool-call message is only remembered along with its results.
+            """
+            nonlocal logged
+            records = [_to_memory(msg) for msg in msgs]
+            messages.extend(msgs)
+            mem_log.extend(records)
+            append_memory(*records)
+            logged += len(records)
+
+        system_msg = SystemMessage(
+            content=SYSTEM_PROMPT.format(
+                github_username=config.get("github_username", ""),
+                github_email=config.get("github_email", ""),
             )
-            console.rule(style="cyan")
-            console.print()
-
-            lc_tools = mcp_tools_to_langchain(mcp_tools)
-            local_tools = get_git_tools()
-            local_tool_map = {t.name: t for t in local_tools}
-
-            llm_with_tools = llm.bind_tools(lc_tools + local_tools)
-
-            raw_memory = load_memory()
-            messages = _deserialize_messages(raw_memory)
+        )
 
-            system_msg = SystemMessage(
-                content=SYSTEM_PROMPT.format(
-                    github_username=config.get("github_username", ""),
-                    github_email=config.get("github_email", ""),
-                )
+        while True:
+            try:
+                user_input = console.input("[bold cyan]  You → [/bold cyan]")
+            except (KeyboardInterrupt, EOFError):
+                console.print("\n[muted]  Goodbye! 👋[/muted]")
+                break
+
+            user_input = user_input.strip()
+            if not user_input:
+                continue
+            if user_input.lower() in ("exit", "quit", "q"):
+                console.print("\n[muted]  Goodbye! 👋[/muted]")
+                break
+
+            if user_input.lower() == "/refresh":
+                clear_mcp_cache()
+                console.print("[muted]  GitHub results cache cleared.[/muted]")
+                continue
+
+            remember(HumanMessage(content=user_input))
+
+            await _run_turn(
+                llm,
+                base_tools,
+                base_llm_with_tools,
+                system_msg,
+                messages,
+                remember,
+                local_tool_map,
+                tool_index,
             )
 
-            while True:
-                try:
-                    user_input = console.input("[bold cyan]  You → [/bold cyan]")
-                except (KeyboardInterrupt, EOFError):
-                    console.print("\n[muted]  Goodbye! 👋[/muted]")
-                    break
-
-                user_input = user_input.strip()
-                if not user_input:
-                    continue
-                if user_input.lower() in ("exit", "quit", "q"):
-                    console.print("\n[muted]  Goodbye! 👋[/muted]")
-                    break
-
-                messages.append(HumanMessage(content=user_input))
-
-                full_messages = [system_msg] + messages
-
-                with print_thinking():
-                    response = await asyncio.to_thread(
-                        llm_with_tools.invoke, full_messages
-                    )
-
-                while response.tool_calls:
-                    messages.append(response)
-
-                    for tool_call in response.tool_calls:
-                        tool_name = tool_call["name"]
-                        tool_args = tool_call["args"]
-                        tool_id = tool_call["id"]
-
-                        print_tool_call(tool_name, tool_args)
-
-                        try:
-                            with print_thinking():
-                                if tool_name in local_tool_map:
-                                    result = local_tool_map[tool_name].invoke(tool_args)
-                                else:
-                                    result = await call_mcp_tool(
-                                        session, tool_name, tool_args
-                                    )
-                            print_tool_result(result)
-                        except Exception as e:
-                            result = f"Error calling tool '{tool_name}': {e}"
-                            print_error(result)
-
-                        llm_result = (
-                            result
-                            if len(result) < 4000
-                            else result[:4000] + "\n... (truncated)"
-                        )
-
-                        messages.append(
-                            ToolMessage(content=llm_result, tool_call_id=tool_id)
-                        )
-
-                    full_messages = [system_msg] + messages
-                    with print_thinking():
-                        response = await asyncio.to_thread(
-                            llm_with_tools.invoke, full_messages
-                        )
-
-                messages.append(response)
-                print_response(response.content)
-
-                save_memory(_serialize_messages(messages))
-
-                if len(messages) > 50:
-                    messages = messages[-50:]
+            # Trim the window between turns, never in the middle of one.
+            start = _window_start([msg.type for msg in messages], MEMORY_LIMIT)
+            if start:
+                del messages[:start]
+                del mem_log[:start]
+
+            # Compact the append-only log once it holds two windows' worth.
+            if logged > 2 * MEMORY_LIMIT:
+                save_memory(mem_log)
+                logged = len(mem_log)
 
     except FileNotFoundError as e:
         print_error(str(e))
@@ -208,3 +453,5 @@ async def run_agent_loop():
         while hasattr(actual, "exceptions") and actual.exceptions:
             actual = actual.exceptions[0]
         print_error(f"MCP connection failed: {actual}")
+    finally:
+        await mcp_sessions.close()
@@ -0,0 +1,41 @@
+"""
+Small in-process cache with per-entry expiry.
+"""
+
+import time
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire `ttl` seconds after being stored.
+    When full, the oldest entry is evicted first.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict = {}
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing/expired."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the oldest entry if full."""
+        if key not in self._data and len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def clear(self):
+        """Drop every entry."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -3,13 +3,22 @@ GitBot configuration management.
 Reads/writes config from ~/.gitbot/config.json
 """
 
-import json
+import copy
 import os
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
+
+import orjson
 
 CONFIG_DIR = Path.home() / ".gitbot"
 CONFIG_FILE = CONFIG_DIR / "config.json"
-MEMORY_FILE = CONFIG_DIR / "memory.json"
+MEMORY_FILE = CONFIG_DIR / "memory.jsonl"
+LEGACY_MEMORY_FILE = CONFIG_DIR / "memory.json"
+CACHE_DIR = CONFIG_DIR / "cache"
+
+# Appended to any tool output (git or GitHub) cut short to fit a size limit.
+TRUNCATION_MARKER = "\n... (truncated)"
 
 DEFAULT_CONFIG = {
     "github_email": "",
@@ -20,47 +29,105 @@ DEFAULT_CONFIG = {
     "groq_api_key": "",
     "gemini_api_key": "",
     "ollama_base_url": "http://localhost:11434",
+    "llm_max_tokens": 2048,
 }
 
+# (mtime_ns, parsed config) of the last read of CONFIG_FILE.
+_CACHE: tuple[int, dict] | None = None
+
+
+@dataclass(slots=True)
+class MemMsg:
+    """One persisted chat message; orjson serializes it directly."""
+
+    type: str
+    content: str
+    tool_calls: list | None = None
+    tool_call_id: str | None = None
+
 
 def ensure_config_dir():
     """Create the config directory if it doesn't exist."""
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 
+def _read_config() -> dict | None:
+    """Return the parsed config file, re-reading it only when its mtime changes."""
+    global _CACHE
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _CACHE is None or _CACHE[0] != mtime:
+        _CACHE = (mtime, orjson.loads(CONFIG_FILE.read_bytes()))
+    return _CACHE[1]
+
+
 def load_config() -> dict:
     """Load config from disk. Returns default config if file doesn't exist."""
-    if CONFIG_FILE.exists():
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+    config = _read_config()
+    if config is not None:
+        return copy.deepcopy(config)
     return DEFAULT_CONFIG.copy()
 
 
 def save_config(config: dict):
     """Save config dict to disk."""
+    global _CACHE
     ensure_config_dir()
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=2)
+    CONFIG_FILE.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
+    _CACHE = None
 
 
 def is_onboarded() -> bool:
     """Check if the user has completed onboarding."""
-    if not CONFIG_FILE.exists():
+    config = _read_config()
+    if config is None:
         return False
-    config = load_config()
     return bool(config.get("github_token")) and bool(config.get("llm_provider"))
 
 
-def load_memory() -> list:
-    """Load chat memory from disk."""
-    if MEMORY_FILE.exists():
-        with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
+def load_memory() -> Iterator[dict]:
+    """Stream chat memory entries from disk, one JSON object per line."""
+    if not MEMORY_FILE.exists() and LEGACY_MEMORY_FILE.exists():
+        # One-time migration from the old single-document memory.json.
+        save_memory(orjson.loads(LEGACY_MEMORY_FILE.read_bytes()))
+        LEGACY_MEMORY_FILE.unlink()
+
+    if not MEMORY_FILE.exists():
+        return
+
+    with open(MEMORY_FILE, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # A torn final line from an interrupted append — skip it.
+                continue
+
+
+def append_memory(*entries: MemMsg | dict):
+    """Append chat memory entries to disk in a single write."""
+    ensure_config_dir()
+    with open(MEMORY_FILE, "ab") as f:
+        f.write(
+            b"".join(
+                orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+                for entry in entries
+            )
+        )
 
 
-def save_memory(messages: list):
-    """Save chat memory to disk."""
+def save_memory(messages: Iterable[MemMsg | dict]):
+    """Atomically rewrite chat memory on disk (used to compact the log)."""
     ensure_config_dir()
-    with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(messages, f, indent=2)
+    tmp_file = MEMORY_FILE.with_suffix(".jsonl.tmp")
+    tmp_file.write_bytes(
+        b"".join(
+            orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in messages
+        )
+    )
+    os.replace(tmp_file, MEMORY_FILE)
@@ -3,50 +3,292 @@ Local Git Orchestrator — wraps git CLI commands.
 Responsible for executing git operations on the local filesystem.
 """
 
+import asyncio
+import functools
+import os
+import shlex
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from gitbot.core.config import TRUNCATION_MARKER
+
+# Repo paths may be given as plain strings or path objects.
+StrPath = str | os.PathLike[str]
+
+# Python opens fds non-inheritable (PEP 446), so on POSIX git has nothing to
+# inherit and skipping the close-all-fds sweep makes each spawn cheaper.
+_CLOSE_FDS = os.name != "posix"
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve(path: str) -> str:
+    return str(Path(path).resolve())
+
+
+def _c_locale() -> dict[str, str]:
+    """Environment that keeps git's messages in English, whatever the locale."""
+    return {**os.environ, "LC_ALL": "C"}
+
+
+def _cwd(path: StrPath) -> str:
+    """Absolute working directory for git, resolving relative paths once."""
+    path = os.fspath(path)
+    return path if os.path.isabs(path) else _resolve(path)
+
+
+def _stamp(path: str) -> tuple[int, int] | None:
+    """Inode and mtime of a file; git rewrites refs by rename, changing both."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def _dir_stamps(root: str) -> list:
+    """
+    Stamps of a directory and every directory below it. Loose refs are
+    written to a lock file and renamed into place, which changes the
+    mtime of the directory holding them however deeply it is nested.
+    """
+    stamps = []
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        stamps.append((path, _stamp(path)))
+        try:
+            with os.scandir(path) as entries:
+                stack.extend(e.path for e in entries if e.is_dir(follow_symlinks=False))
+        except OSError:
+            pass
+    return stamps
+
+
+# Most `git log` results kept before the cache is dropped wholesale.
+_LOG_CACHE_SIZE = 64
+
 
 class GitOrchestrator:
     def __init__(self):
-        self._check_git_installed()
+        self._git = self._check_git_installed()
+        self._log_cache: dict[tuple, dict] = {}
 
-    def _check_git_installed(self):
-        if not shutil.which("git"):
+    def _check_git_installed(self) -> str:
+        # The resolved path is exec'd directly, so spawns skip the PATH search.
+        git = shutil.which("git")
+        if not git:
             raise RuntimeError("Git is not installed or not on PATH.")
+        return git
+
+    @staticmethod
+    def _result(
+        returncode: int, stdout: str, stderr: str, truncated: bool = False
+    ) -> dict:
+        stdout = stdout.strip()
+        if truncated:
+            stdout += TRUNCATION_MARKER
+        return {
+            "success": returncode == 0,
+            "stdout": stdout,
+            "stderr": stderr.strip(),
+            "returncode": returncode,
+        }
+
+    @staticmethod
+    def _error(e: Exception) -> dict:
+        return {
+            "success": False,
+            "stdout": "",
+            "stderr": str(e),
+            "returncode": -1,
+        }
+
+    def _run_git(
+        self,
+        args: list[str],
+        cwd: StrPath,
+        max_bytes: int | None = None,
+        env: dict[str, str] | None = None,
+    ) -> dict:
+        """
+        Run a git command in the specified directory.
+        With max_bytes, git is stopped once stdout goes past that many bytes;
+        stderr is drained on a thread meanwhile so a full pipe can't block git.
+        """
+        try:
+            with subprocess.Popen(
+                [self._git] + args,
+                cwd=_cwd(cwd),
+                env=env,
+                close_fds=_CLOSE_FDS,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            ) as proc:
+                if max_bytes is None:
+                    stdout, stderr = proc.communicate()
+                    truncated = False
+                else:
+                    with ThreadPoolExecutor(max_workers=1) as pool:
+                        stderr_future = pool.submit(proc.stderr.read)
+                        stdout = proc.stdout.read(max_bytes + 1)
+                        truncated = len(stdout) > max_bytes
+                        if truncated:
+                            stdout = stdout[:max_bytes]
+                            proc.kill()
+                        stderr = stderr_future.result()
+                returncode = proc.wait()
+            if truncated:
+                returncode = 0  # Stopped on purpose, not a git failure.
+            return self._result(
+                returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
+                truncated,
+            )
+        except Exception as e:
+            return self._error(e)
+
+    def _run_batch(self, cmds: list[list[str]], cwd: StrPath) -> dict:
+        """
+        Run several git commands in order, stopping at the first failure.
+        On POSIX they are chained with && under one `sh -c`, so Python starts
+        a single process; elsewhere they run one by one.
+        """
+        if not cmds:
+            return self._result(0, "", "")
+        if os.name != "posix":
+            outputs = []
+            for args in cmds:
+                result = self._run_git(args, cwd=cwd)
+                outputs.append(result["stdout"])
+                if not result["success"]:
+                    break
+            result["stdout"] = "\n".join(filter(None, outputs))
+            return result
 
-    def _run_git(self, args: list[str], cwd: Path) -> dict:
-        """Run a git command in the specified directory."""
+        script = " && ".join(shlex.join([self._git, *args]) for args in cmds)
         try:
             result = subprocess.run(
-                ["git"] + args,
-                cwd=str(cwd.resolve()),
+                ["sh", "-c", script],
+                cwd=_cwd(cwd),
+                close_fds=_CLOSE_FDS,
                 capture_output=True,
-                text=True,
                 check=False,
-                encoding="utf-8",
-                errors="replace",
             )
-            return {
-                "success": result.returncode == 0,
-                "stdout": result.stdout.strip(),
-                "stderr": result.stderr.strip(),
-                "returncode": result.returncode,
-            }
+            return self._result(
+                result.returncode,
+                result.stdout.decode("utf-8", errors="replace"),
+                result.stderr.decode("utf-8", errors="replace"),
+            )
         except Exception as e:
-            return {
-                "success": False,
-                "stdout": "",
-                "stderr": str(e),
-                "returncode": -1,
-            }
+            return self._error(e)
+
+    async def _run_git_async(
+        self,
+        args: list[str],
+        cwd: StrPath,
+        max_bytes: int | None = None,
+        env: dict[str, str] | None = None,
+    ) -> dict:
+        """
+        Run a git command without blocking the event loop.
+        With max_bytes, git is stopped once stdout goes past that many bytes.
+        """
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                self._git,
+                *args,
+                cwd=_cwd(cwd),
+                env=env,
+                close_fds=_CLOSE_FDS,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            if max_bytes is None:
+                stdout, stderr = await proc.communicate()
+                returncode, truncated = proc.returncode, False
+            else:
+                stderr_task = asyncio.ensure_future(proc.stderr.read())
+                try:
+                    stdout = await proc.stdout.readexactly(max_bytes + 1)
+                except asyncio.IncompleteReadError as e:
+                    stdout = e.partial
+                truncated = len(stdout) > max_bytes
+                if truncated:
+                    stdout = stdout[:max_bytes]
+                    proc.kill()
+                stderr = await stderr_task
+                returncode = await proc.wait()
+                if truncated:
+                    returncode = 0  # Stopped on purpose, not a git failure.
+            return self._result(
+                returncode,
+                stdout.decode("utf-8", errors="replace"),
+                stderr.decode("utf-8", errors="replace"),
+                truncated,
+            )
+        except Exception as e:
+            return self._error(e)
+
+    @staticmethod
+    def _check_remote_added(result: dict, name: str) -> dict:
+        # Let `git remote add` detect duplicates itself instead of listing
+        # remotes first — one process instead of two. Callers run it under
+        # the C locale so the message below isn't translated.
+        if not result["success"] and "already exists" in result["stderr"]:
+            return {"success": False, "stderr": f"Remote '{name}' already exists."}
+        return result
+
+    def _log_key(self, path: StrPath, *args) -> tuple | None:
+        """
+        Cache key for `git log` with the given args. `--decorate` prints every
+        ref pointing into the log, so the key stamps HEAD, the branch it points
+        to, packed-refs and every directory of the loose ref (and reftable)
+        stores: commits, checkouts, new or moved branches at any depth, tags
+        and remote-tracking updates all miss. Returns None (don't cache) when
+        `.git` is not a plain directory.
+        """
+        cwd = _cwd(path)
+        git_dir = os.path.join(cwd, ".git")
+        head = os.path.join(git_dir, "HEAD")
+        try:
+            with open(head, encoding="utf-8") as f:
+                target = f.read().strip()
+        except OSError:
+            return None
+
+        stamps = [_stamp(head)]
+        if target.startswith("ref: "):
+            stamps.append(_stamp(os.path.join(git_dir, target[5:])))
+        stamps.append(_stamp(os.path.join(git_dir, "packed-refs")))
+        for name in ("refs", "reftable"):
+            stamps.extend(_dir_stamps(os.path.join(git_dir, name)))
+        return (cwd, *args, *stamps)
+
+    def _cached_log(self, key: tuple | None) -> dict | None:
+        if key is None:
+            return None
+        cached = self._log_cache.get(key)
+        return dict(cached) if cached is not None else None
+
+    def _cache_log(self, key: tuple | None, result: dict) -> dict:
+        if key is not None and result["success"]:
+            if len(self._log_cache) >= _LOG_CACHE_SIZE:
+                self._log_cache.clear()
+            self._log_cache[key] = dict(result)
+        return result
 
-    def is_git_initialized(self, path: Path) -> bool:
-        """Check if a directory is a git repository."""
-        return (path.resolve() / ".git").is_dir()
+    def is_git_initialized(self, path: StrPath) -> bool:
+        """
+        Check if a directory is a git repository.
+        `.git` may also be a file, pointing at the real repo for worktrees.
+        """
+        git_dir = os.path.join(path, ".git")
+        return os.path.isdir(git_dir) or os.path.isfile(git_dir)
 
-    def git_init(self, path: Path) -> dict:
+    def git_init(self, path: StrPath) -> dict:
         """Initialize a new git repository."""
         if self.is_git_initialized(path):
             return {
@@ -55,16 +297,16 @@ class GitOrchestrator:
                 "stderr": "",
             }
 
-        path.mkdir(parents=True, exist_ok=True)
+        os.makedirs(path, exist_ok=True)
         return self._run_git(["init"], cwd=path)
 
-    def git_status(self, path: Path) -> dict:
+    def git_status(self, path: StrPath, max_bytes: int | None = None) -> dict:
         """Get git status."""
         if not self.is_git_initialized(path):
             return {"success": False, "stderr": "Not a git repository."}
-        return self._run_git(["status"], cwd=path)
+        return self._run_git(["status"], cwd=path, max_bytes=max_bytes)
 
-    def git_add(self, path: Path, files: list[str]) -> dict:
+    def git_add(self, path: StrPath, files: list[str]) -> dict:
         """Stage files."""
         if not self.is_git_initialized(path):
             return {"success": False, "stderr": "Not a git repository."}
@@ -72,9 +314,10 @@ class GitOrchestrator:
         if not files:
             return {"success": False, "stderr": "No files specified to add."}
 
+        self._log_cache.clear()
         return self._run_git(["add"] + files, cwd=path)
 
-    def git_commit(self, path: Path, message: str) -> dict:
+    def git_commit(self, path: StrPath, message: str) -> dict:
         """Commit staged changes."""
         if not self.is_git_initialized(path):
             return {"success": False, "stderr": "Not a git repository."}
@@ -82,40 +325,132 @@ class GitOrchestrator:
         if not message:
             return {"success": False, "stderr": "Commit message is required."}
 
+        self._log_cache.clear()
         return self._run_git(["commit", "-m", message], cwd=path)
 
-    def git_log(self, path: Path, n: int = 10) -> dict:
+    def git_log(self, path: StrPath, n: int = 10, max_bytes: int | None = None) -> dict:
         """Show commit log."""
         if not self.is_git_initialized(path):
             return {"success": False, "stderr": "Not a git repository."}
 
-        return self._run_git(
-            ["log", f"-n {n}", "--oneline", "--graph", "--decorate"], cwd=path
+        key = self._log_key(path, n, max_bytes)
+        cached = self._cached_log(key)
+        if cached is not None:
+            return cached
+
+        result = self._run_git(
+            ["log", "-n", str(n), "--oneline", "--graph", "--decorate"],
+            cwd=path,
+            max_bytes=max_bytes,
         )
+        return self._cache_log(key, result)
 
-    def git_remote_add(self, path: Path, name: str, url: str) -> dict:
+    def git_remote_add(self, path: StrPath, name: str, url: str) -> dict:
         """Add a remote."""
         if not self.is_git_initialized(path):
             return {"success": False, "stderr": "Not a git repository."}
 
-        # Check if remote exists
-        remotes = self._run_git(["remote"], cwd=path)
-        if name in remotes["stdout"].split():
-            return {"success": False, "stderr": f"Remote '{name}' already exists."}
-
-        return self._run_git(["remote", "add", name, url], cwd=path)
+        self._log_cache.clear()
+        result = self._run_git(["remote", "add", name, url], cwd=path, env=_c_locale())
+        return self._check_remote_added(result, name)
 
     def git_push(
-        self, path: Path, remote: str = "origin", branch: str = "main"
+        self, path: StrPath, remote: str = "origin", branch: str = "main"
     ) -> dict:
         """Push to remote."""
         if not self.is_git_initialized(path):
             return {"success": False, "stderr": "Not a git repository."}
 
+        self._log_cache.clear()
         return self._run_git(["push", "-u", remote, branch], cwd=path)
 
-    def ensure_git_ready(self, path: Path) -> dict:
+    def ensure_git_ready(self, path: StrPath) -> dict:
         """Ensure git is initialized."""
         if not self.is_git_initialized(path):
             return self.git_init(path)
         return {"success": True, "stdout": "Git is ready.", "stderr": ""}
+
+    # Async variants — same checks and return shape, but git runs via
+    # asyncio subprocesses so the agent's event loop stays free.
+
+    async def git_init_async(self, path: StrPath) -> dict:
+        """Initialize a new git repository."""
+        if self.is_git_initialized(path):
+            return {
+                "success": True,
+                "stdout": "Already a git repository.",
+                "stderr": "",
+            }
+
+        os.makedirs(path, exist_ok=True)
+        return await self._run_git_async(["init"], cwd=path)
+
+    async def git_status_async(
+        self, path: StrPath, max_bytes: int | None = None
+    ) -> dict:
+        """Get git status."""
+        if not self.is_git_initialized(path):
+            return {"success": False, "stderr": "Not a git repository."}
+        return await self._run_git_async(["status"], cwd=path, max_bytes=max_bytes)
+
+    async def git_add_async(self, path: StrPath, files: list[str]) -> dict:
+        """Stage files."""
+        if not self.is_git_initialized(path):
+            return {"success": False, "stderr": "Not a git repository."}
+
+        if not files:
+            return {"success": False, "stderr": "No files specified to add."}
+
+        self._log_cache.clear()
+        return await self._run_git_async(["add"] + files, cwd=path)
+
+    async def git_commit_async(self, path: StrPath, message: str) -> dict:
+        """Commit staged changes."""
+        if not self.is_git_initialized(path):
+            return {"success": False, "stderr": "Not a git repository."}
+
+        if not message:
+            return {"success": False, "stderr": "Commit message is required."}
+
+        self._log_cache.clear()
+        return await self._run_git_async(["commit", "-m", message], cwd=path)
+
+    async def git_log_async(
+        self, path: StrPath, n: int = 10, max_bytes: int | None = None
+    ) -> dict:
+        """Show commit log."""
+        if not self.is_git_initialized(path):
+            return {"success": False, "stderr": "Not a git repository."}
+
+        key = self._log_key(path, n, max_bytes)
+        cached = self._cached_log(key)
+        if cached is not None:
+            return cached
+
+        result = await self._run_git_async(
+            ["log", "-n", str(n), "--oneline", "--graph", "--decorate"],
+            cwd=path,
+            max_bytes=max_bytes,
+        )
+        return self._cache_log(key, result)
+
+    async def git_remote_add_async(self, path: StrPath, name: str, url: str) -> dict:
+        """Add a remote."""
+        if not self.is_git_initialized(path):
+            return {"success": False, "stderr": "Not a git repository."}
+
+        self._log_cache.clear()
+        result = await self._run_git_async(
+            ["remote", "add", name, url], cwd=path, env=_c_locale()
+        )
+        return self._check_remote_added(result, name)
+
+    async def git_push_async(
+        self, path: StrPath, remote: str = "origin", branch: str = "main"
+    ) -> dict:
+        """Push to remote."""
+        if not self.is_git_initialized(path):
+            return {"success": False, "stderr": "Not a git repository."}
+
+        self._log_cache.clear()
+        return await self._run_git_async(["push", "-u", remote, branch], cwd=path)
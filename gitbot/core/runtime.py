@@ -0,0 +1,33 @@
+"""
+Asyncio runtime setup for the agent process.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _pool_size() -> int:
+    """Worker count from GITBOT_POOL_SIZE, else a default sized for I/O."""
+    default = max(16, (os.cpu_count() or 4) * 5)
+    try:
+        return max(1, int(os.environ.get("GITBOT_POOL_SIZE", default)))
+    except ValueError:
+        return default
+
+
+def install_executor() -> ThreadPoolExecutor:
+    """
+    Install a thread pool sized for I/O-bound work as the running loop's
+    default executor (used by asyncio.to_thread and LangChain's sync
+    fallbacks).
+
+    The stdlib default of min(32, cpu_count + 4) workers is tuned for CPU
+    work and can stall concurrent tool dispatch. The pool is per process;
+    set GITBOT_POOL_SIZE to override its size.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=_pool_size(), thread_name_prefix="gitbot-io"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+    return executor
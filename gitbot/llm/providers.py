@@ -2,9 +2,7 @@
 LLM factory — returns a LangChain chat model based on config.
 """
 
-from langchain_groq import ChatGroq
-from langchain_ollama import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
+from gitbot.core.config import DEFAULT_CONFIG
 
 
 def get_llm(config: dict):
@@ -15,9 +13,13 @@ def get_llm(config: dict):
       - groq   → ChatGroq  (requires groq_api_key)
       - gemini → ChatGoogleGenerativeAI (requires gemini_api_key)
       - ollama → ChatOllama (requires local Ollama server running)
+
+    Models stream their output and cap replies at `llm_max_tokens`.
+    Provider packages are imported only for the provider in use.
     """
     provider = config.get("llm_provider", "").lower()
     model = config.get("llm_model", "")
+    max_tokens = config.get("llm_max_tokens") or DEFAULT_CONFIG["llm_max_tokens"]
 
     if provider == "groq":
         api_key = config.get("groq_api_key", "")
@@ -25,10 +27,15 @@ def get_llm(config: dict):
             raise ValueError(
                 "Groq API key is not configured. Run 'gitbot onboard' first."
             )
+        from langchain_groq import ChatGroq
+
         return ChatGroq(
             model=model,
             api_key=api_key,
             temperature=0,
+            max_tokens=max_tokens,
+            streaming=True,
+            model_kwargs={"top_p": 1.0},
         )
 
     elif provider == "gemini":
@@ -37,18 +44,27 @@ def get_llm(config: dict):
             raise ValueError(
                 "Gemini API key is not configured. Run 'gitbot onboard' first."
             )
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         return ChatGoogleGenerativeAI(
             model=model,
             google_api_key=api_key,
             temperature=0,
+            max_output_tokens=max_tokens,
+            top_p=1.0,
+            streaming=True,
         )
 
     elif provider == "ollama":
+        from langchain_ollama import ChatOllama
+
         base_url = config.get("ollama_base_url", "http://localhost:11434")
         return ChatOllama(
             model=model,
             base_url=base_url,
             temperature=0,
+            num_predict=max_tokens,
+            top_p=1.0,
         )
 
     else:
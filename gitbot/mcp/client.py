@@ -4,13 +4,77 @@ Exposes tools for the agent loop.
 """
 
 import asyncio
-import json
+import hashlib
 import os
+import re
 import shutil
 from contextlib import asynccontextmanager
 
+import anyio
+import orjson
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+from gitbot.core.cache import TTLCache
+from gitbot.core.config import CACHE_DIR, TRUNCATION_MARKER
+
+# Longest tool result handed back to the LLM.
+MAX_TOOL_RESULT = 4000
+
+# Schema keys rejected by at least one LLM provider (e.g. Gemini).
+UNSUPPORTED_SCHEMA_KEYS = frozenset({"$schema", "additionalProperties"})
+
+# Bump when the conversion below changes, so stale tool caches are ignored.
+TOOL_CACHE_VERSION = 1
+
+# GitHub MCP tools without side effects, whose results may be briefly cached.
+READ_ONLY_MCP_TOOLS = frozenset(
+    {
+        "get_repo",
+        "get_file_contents",
+        "get_issue",
+        "get_pull_request",
+        "get_pull_request_files",
+        "list_commits",
+        "list_issues",
+        "list_pull_requests",
+        "search_code",
+        "search_issues",
+        "search_repositories",
+        "search_users",
+    }
+)
+
+_RESULT_CACHE = TTLCache(maxsize=256, ttl=30)
+
+# Longest description kept inside a tool's parameter schema.
+MAX_SCHEMA_DESCRIPTION = 200
+
+MCP_RETRIEVE_TOOL = {
+    "name": "mcp_retrieve",
+    "description": (
+        "Find GitHub tools for a task (issues, pull requests, repositories, "
+        "files, branches, commits, search). Call this before any GitHub "
+        "operation; the matching tools become callable on your next step."
+    ),
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "keywords": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": 'Keywords for the operation, e.g. ["create", "issue"].',
+            }
+        },
+        "required": ["keywords"],
+    },
+}
+
+
+# Snapshot of os.environ taken on first use; the server only needs the token added.
+_BASE_ENV: dict[str, str] | None = None
 
 
 def _find_npx() -> str:
@@ -28,8 +92,10 @@ def build_server_params(github_token: str) -> StdioServerParameters:
     """Build the stdio server parameters for the GitHub MCP server."""
     npx_path = _find_npx()
 
-    env = os.environ.copy()
-    env["GITHUB_PERSONAL_ACCESS_TOKEN"] = github_token
+    global _BASE_ENV
+    if _BASE_ENV is None:
+        _BASE_ENV = dict(os.environ)
+    env = _BASE_ENV | {"GITHUB_PERSONAL_ACCESS_TOKEN": github_token}
 
     return StdioServerParameters(
         command=npx_path,
@@ -39,10 +105,11 @@ def build_server_params(github_token: str) -> StdioServerParameters:
 
 
 @asynccontextmanager
-async def connect_mcp(github_token: str):
+async def connect_mcp(github_token: str, list_tools: bool = True):
     """
     Async context manager that starts the GitHub MCP server and yields
-    (session, tools_list).
+    (session, tools_list). With list_tools=False the tool listing is
+    skipped and tools_list is None.
 
     Usage:
         async with connect_mcp(token) as (session, tools):
@@ -54,38 +121,51 @@ async def connect_mcp(github_token: str):
         async with ClientSession(read_stream, write_stream) as session:
             await session.initialize()
 
-            tools_response = await session.list_tools()
-            tools = tools_response.tools
+            tools = None
+            if list_tools:
+                tools_response = await session.list_tools()
+                tools = tools_response.tools
 
             yield session, tools
 
 
 def _clean_schema(schema: dict) -> dict:
-    """Remove keys not supported by all LLM providers (e.g. Gemini)."""
+    """
+    Remove keys not supported by all LLM providers (e.g. Gemini).
+
+    Cleans the schema in place, walking it with an explicit stack, and
+    returns it.
+    """
     if not isinstance(schema, dict):
         return schema
 
-    unsupported_keys = {"$schema", "additionalProperties"}
-    cleaned = {}
-    for key, value in schema.items():
-        if key in unsupported_keys:
-            continue
-        if isinstance(value, dict):
-            cleaned[key] = _clean_schema(value)
-        elif isinstance(value, list):
-            cleaned[key] = [
-                _clean_schema(item) if isinstance(item, dict) else item
-                for item in value
-            ]
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in UNSUPPORTED_SCHEMA_KEYS:
+                if key in node:
+                    del node[key]
+            description = node.get("description")
+            if isinstance(description, str):
+                node["description"] = description[:MAX_SCHEMA_DESCRIPTION]
+            children = node.values()
         else:
-            cleaned[key] = value
-    return cleaned
+            children = node
+        for child in children:
+            if isinstance(child, (dict, list)):
+                stack.append(child)
+    return schema
 
 
 def mcp_tools_to_langchain(tools) -> list[dict]:
     """
     Convert MCP tool definitions to LangChain-compatible tool schemas.
     Cleans unsupported schema keys for cross-provider compatibility.
+
+    The tools' input schemas are cleaned in place: they are freshly parsed
+    from the server's list_tools response and not used elsewhere, so copying
+    them first would only double the work.
     """
     lc_tools = []
     for tool in tools:
@@ -103,15 +183,262 @@ def mcp_tools_to_langchain(tools) -> list[dict]:
     return lc_tools
 
 
-async def call_mcp_tool(session: ClientSession, name: str, arguments: dict) -> str:
-    """Call an MCP tool and return the text result."""
-    result = await session.call_tool(name, arguments)
+def load_langchain_tools(tools) -> list[dict]:
+    """
+    Same as mcp_tools_to_langchain, but cached on disk.
+
+    The cache file is keyed by a hash of the raw tool definitions, so a
+    server upgrade that changes any tool simply misses and rebuilds.
+    """
+    digest = hashlib.blake2b(
+        orjson.dumps(
+            [TOOL_CACHE_VERSION]
+            + [(t.name, t.description, t.inputSchema) for t in tools],
+            option=orjson.OPT_SORT_KEYS,
+        )
+    ).hexdigest()[:16]
+    cache_file = CACHE_DIR / f"tools_{digest}.json"
+
+    try:
+        return orjson.loads(cache_file.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        pass
+
+    lc_tools = mcp_tools_to_langchain(tools)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in CACHE_DIR.glob("tools_*.json"):
+            stale.unlink(missing_ok=True)
+        cache_file.write_bytes(orjson.dumps(lc_tools))
+    except OSError:
+        pass  # Caching is best-effort.
+    return lc_tools
+
+
+class MCPToolIndex:
+    """
+    Keyword index over converted MCP tool schemas.
+
+    Backs the mcp_retrieve meta-tool: instead of binding every GitHub tool
+    to the LLM on every call, only the tools retrieved for the current turn
+    are bound, which keeps the prompt small.
+    """
 
+    def __init__(self, lc_tools: list[dict], limit: int = 8):
+        self._tools = lc_tools
+        self._limit = limit
+        self.selected: dict[str, dict] = {}
+
+    def retrieve(self, keywords: list[str] | str) -> str:
+        """Select the tools best matching the keywords and describe them."""
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        terms = {
+            term
+            for keyword in keywords
+            for term in re.split(r"[\s_\-]+", keyword.lower())
+            if term
+        }
+
+        scored = []
+        for tool in self._tools:
+            name = tool["name"].lower()
+            description = tool["description"].lower()
+            score = sum(
+                3 if term in name else 1 if term in description else 0 for term in terms
+            )
+            if score:
+                scored.append((score, tool))
+        scored.sort(key=lambda item: item[0], reverse=True)
+
+        matches = [tool for _, tool in scored[: self._limit]]
+        if not matches:
+            return "No matching GitHub tools found. Try different keywords."
+
+        for tool in matches:
+            self.selected[tool["name"]] = tool
+        lines = [
+            f"- {tool['name']}: {tool['description'][:MAX_SCHEMA_DESCRIPTION]}"
+            for tool in matches
+        ]
+        return "These GitHub tools are now available:\n" + "\n".join(lines)
+
+    def reset(self):
+        """Forget the tools selected for the previous turn."""
+        self.selected.clear()
+
+
+def _result_text(result, max_chars: int) -> str:
+    """
+    Join a tool result's content parts into text.
+
+    Parts are assembled only until max_chars is exceeded, so large
+    listings are never joined in full just to be cut down afterwards.
+    """
     parts = []
+    total_len = 0
     for content in result.content:
         if hasattr(content, "text"):
             parts.append(content.text)
         else:
             parts.append(str(content))
 
+        # Count the "\n" separator only between parts, not after the last.
+        total_len += len(parts[-1]) + (len(parts) > 1)
+        if total_len > max_chars:
+            return "\n".join(parts)[:max_chars] + TRUNCATION_MARKER
+
     return "\n".join(parts)
+
+
+def clear_mcp_cache():
+    """Forget all cached read-only tool results."""
+    _RESULT_CACHE.clear()
+
+
+async def call_mcp_tool(
+    session: ClientSession,
+    name: str,
+    arguments: dict,
+    max_chars: int = MAX_TOOL_RESULT,
+) -> str:
+    """
+    Call an MCP tool and return the text result.
+
+    Results of side-effect-free tools are cached briefly, since users often
+    re-ask the same question while refining it. Any other tool call may
+    change what those return, so it clears the cache.
+    """
+    if name not in READ_ONLY_MCP_TOOLS:
+        clear_mcp_cache()
+        return _result_text(await session.call_tool(name, arguments), max_chars)
+
+    key = (name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS), max_chars)
+    cached = _RESULT_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    result = await session.call_tool(name, arguments)
+    text = _result_text(result, max_chars)
+    if not result.isError:
+        _RESULT_CACHE.set(key, text)
+    return text
+
+
+def _is_transport_error(e: Exception) -> bool:
+    """True if the error means the MCP server connection itself is gone."""
+    if isinstance(e, McpError):
+        return e.error.code == CONNECTION_CLOSED
+    return isinstance(
+        e, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+    )
+
+
+class MCPSessionManager:
+    """
+    Keeps a single GitHub MCP session alive and reconnects lazily.
+
+    Starting the server (npx, initialize handshake, list_tools) takes
+    seconds, so the session is created once and reused. If its transport
+    breaks, the next tool call starts a fresh one; the tool list from the
+    first connection is kept.
+
+    The stdio/session context managers are owned by a background task so
+    they are entered and exited in the same task, as anyio requires, no
+    matter which task triggers a reconnect.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._token: str | None = None
+        self._tools: list | None = None
+        self._session: ClientSession | None = None
+        self._task: asyncio.Task | None = None
+        self._stop: asyncio.Event | None = None
+
+    async def _serve(
+        self, github_token: str, ready: asyncio.Future, stop: asyncio.Event
+    ):
+        try:
+            async with connect_mcp(github_token, list_tools=self._tools is None) as (
+                session,
+                tools,
+            ):
+                if tools is not None:
+                    self._tools = tools
+                ready.set_result(session)
+                await stop.wait()
+        except asyncio.CancelledError:
+            if not ready.done():
+                ready.cancel()
+            raise
+        except BaseException as e:
+            # Startup failures go to the waiter; later transport failures
+            # surface on the next tool call instead.
+            if not ready.done():
+                ready.set_exception(e)
+
+    async def get_or_create(self, github_token: str) -> tuple[ClientSession, list]:
+        """Return the live (session, tools), connecting first if needed."""
+        async with self._lock:
+            if (
+                self._session is None
+                or self._token != github_token
+                or self._task.done()
+            ):
+                await self._shutdown()
+                if self._token != github_token:
+                    self._token, self._tools = github_token, None
+
+                ready = asyncio.get_running_loop().create_future()
+                stop = asyncio.Event()
+                task = asyncio.create_task(self._serve(github_token, ready, stop))
+                self._session = await ready
+                self._task, self._stop = task, stop
+
+            return self._session, self._tools
+
+    async def call_tool(self, name: str, arguments: dict) -> str:
+        """
+        Call an MCP tool on the live session.
+
+        A dead server is restarted before the call. If the transport breaks
+        mid-call the session is dropped and the error re-raised rather than
+        retried, since the tool may already have had side effects; the next
+        call reconnects.
+        """
+        if self._token is None:
+            raise RuntimeError("MCP session has not been started.")
+
+        session, _ = await self.get_or_create(self._token)
+        try:
+            return await call_mcp_tool(session, name, arguments)
+        except Exception as e:
+            if _is_transport_error(e):
+                await self.invalidate(session)
+            raise
+
+    async def invalidate(self, session: ClientSession):
+        """Drop the given session if it is still the active one."""
+        async with self._lock:
+            if self._session is session:
+                await self._shutdown()
+
+    async def close(self):
+        """Shut down the MCP server, if running."""
+        async with self._lock:
+            await self._shutdown()
+
+    async def _shutdown(self):
+        task, stop = self._task, self._stop
+        self._session = self._task = self._stop = None
+        if task is None:
+            return
+        stop.set()
+        try:
+            await task
+        except Exception:
+            pass  # The transport was already broken.
+
+
+mcp_sessions = MCPSessionManager()
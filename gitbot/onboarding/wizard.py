@@ -2,12 +2,11 @@
 GitBot onboarding wizard — collects GitHub creds, LLM provider & model.
 """
 
-import json
-import urllib.request
-import urllib.error
-
+import httpx
 from rich.prompt import Prompt, Confirm
+from rich.text import Text
 
+from gitbot.core.cache import TTLCache
 from gitbot.core.config import save_config, load_config, is_onboarded
 from gitbot.ui.console import (
     console,
@@ -18,8 +17,8 @@ from gitbot.ui.console import (
 )
 
 GROQ_TOOL_MODELS = [
-    "llama-3.3-70b-versatile",
     "llama-3.1-8b-instant",
+    "llama-3.3-70b-versatile",
     "meta-llama/llama-4-scout-17b-16e-instruct",
     "mixtral-8x7b-32768",
     "gemma2-9b-it",
@@ -33,16 +32,35 @@ GEMINI_TOOL_MODELS = [
 ]
 
 
+# Shared keep-alive client, created on first use.
+_ollama_client: httpx.Client | None = None
+
+# Model lists per base URL, reused for a minute.
+_ollama_models = TTLCache(maxsize=4, ttl=60)
+
+
+def _get_ollama_client() -> httpx.Client:
+    global _ollama_client
+    if _ollama_client is None:
+        _ollama_client = httpx.Client(timeout=10.0)
+    return _ollama_client
+
+
 def _fetch_ollama_models(base_url: str) -> list[str]:
     """Fetch locally available models from the Ollama API."""
     url = f"{base_url.rstrip('/')}/api/tags"
+    cached = _ollama_models.get(url)
+    if cached is not None:
+        return list(cached)
+
     try:
-        req = urllib.request.Request(url, method="GET")
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            data = json.loads(resp.read().decode())
-            models = [m["name"] for m in data.get("models", [])]
-            return sorted(models)
-    except urllib.error.URLError as e:
+        resp = _get_ollama_client().get(url)
+        resp.raise_for_status()
+        models = sorted(m["name"] for m in resp.json().get("models", []))
+        if models:
+            _ollama_models.set(url, models)
+        return list(models)
+    except httpx.HTTPError as e:
         print_error(f"Could not connect to Ollama at {base_url}: {e}")
         return []
     except Exception as e:
@@ -128,7 +146,7 @@ def run_onboarding():
         )
         config["ollama_base_url"] = base_url.rstrip("/")
 
-    print_success(f"LLM provider set to [bold]{provider}[/bold].")
+    print_success(Text.assemble("LLM provider set to ", (provider, "bold"), "."))
 
     print_step(3, "Model Selection")
     console.print("[muted]  Pick a model that supports tool calling.[/muted]\n")
@@ -166,7 +184,7 @@ def run_onboarding():
     )
     config["llm_model"] = models[int(choice) - 1]
 
-    print_success(f"Model set to [bold]{config['llm_model']}[/bold].")
+    print_success(Text.assemble("Model set to ", (config["llm_model"], "bold"), "."))
 
     save_config(config)
 
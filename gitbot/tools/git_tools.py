@@ -1,44 +1,59 @@
 """
 LangChain tool wrappers for local git operations.
+Tools are async so the agent can await them without blocking its event loop.
 """
 
-from pathlib import Path
 from langchain_core.tools import tool
 from gitbot.core.git_orchestrator import GitOrchestrator
 
-orchestrator = GitOrchestrator()
+_orchestrator: GitOrchestrator | None = None
+
+
+def _get() -> GitOrchestrator:
+    """Shared orchestrator, created on first use (it looks up git on PATH)."""
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = GitOrchestrator()
+    return _orchestrator
+
+
+# Output cap for commands whose output grows with the repo (status, log).
+MAX_OUTPUT_BYTES = 2000
 
 
 @tool
-def local_git_init(path: str = ".") -> str:
+async def local_git_init(path: str = ".") -> str:
     """
     Initialize a new local git repository.
 
     Args:
         path: Path to initialize the repo in (default: current directory).
     """
-    result = orchestrator.git_init(Path(path))
+    # A stat check, so existing repos never reach the async git path.
+    if _get().is_git_initialized(path):
+        return f"Repo already exists at {path}"
+    result = await _get().git_init_async(path)
     if result["success"]:
         return f"Successfully initialized git repo in {path}"
     return f"Failed to initialize git repo: {result['stderr']}"
 
 
 @tool
-def local_git_status(path: str = ".") -> str:
+async def local_git_status(path: str = ".") -> str:
     """
     Show the working tree status.
 
     Args:
         path: Path to the repo (default: current directory).
     """
-    result = orchestrator.git_status(Path(path))
+    result = await _get().git_status_async(path, MAX_OUTPUT_BYTES)
     if result["success"]:
         return result["stdout"]
     return f"Error getting status: {result['stderr']}"
 
 
 @tool
-def local_git_add(files: list[str], path: str = ".") -> str:
+async def local_git_add(files: list[str], path: str = ".") -> str:
     """
     Add file contents to the staging area.
 
@@ -46,14 +61,14 @@ def local_git_add(files: list[str], path: str = ".") -> str:
         files: List of files to add (e.g. ["file1.py", "."]).
         path: Path to the repo (default: current directory).
     """
-    result = orchestrator.git_add(Path(path), files)
+    result = await _get().git_add_async(path, files)
     if result["success"]:
         return result["stdout"] or "Files staged successfully."
     return f"Error staging files: {result['stderr']}"
 
 
 @tool
-def local_git_commit(message: str, path: str = ".") -> str:
+async def local_git_commit(message: str, path: str = ".") -> str:
     """
     Record changes to the repository.
 
@@ -61,14 +76,14 @@ def local_git_commit(message: str, path: str = ".") -> str:
         message: The commit message.
         path: Path to the repo (default: current directory).
     """
-    result = orchestrator.git_commit(Path(path), message)
+    result = await _get().git_commit_async(path, message)
     if result["success"]:
         return result["stdout"]
     return f"Error committing: {result['stderr']}"
 
 
 @tool
-def local_git_log(n: int = 10, path: str = ".") -> str:
+async def local_git_log(n: int = 10, path: str = ".") -> str:
     """
     Show commit logs.
 
@@ -76,14 +91,14 @@ def local_git_log(n: int = 10, path: str = ".") -> str:
         n: Number of commits to show (default: 10).
         path: Path to the repo (default: current directory).
     """
-    result = orchestrator.git_log(Path(path), n)
+    result = await _get().git_log_async(path, n, MAX_OUTPUT_BYTES)
     if result["success"]:
         return result["stdout"]
     return f"Error getting log: {result['stderr']}"
 
 
 @tool
-def local_git_remote_add(name: str, url: str, path: str = ".") -> str:
+async def local_git_remote_add(name: str, url: str, path: str = ".") -> str:
     """
     Add a remote repository.
 
@@ -92,14 +107,14 @@ def local_git_remote_add(name: str, url: str, path: str = ".") -> str:
         url: URL of the remote.
         path: Path to the repo (default: current directory).
     """
-    result = orchestrator.git_remote_add(Path(path), name, url)
+    result = await _get().git_remote_add_async(path, name, url)
     if result["success"]:
         return f"Remote '{name}' added successfully."
     return f"Error adding remote: {result['stderr']}"
 
 
 @tool
-def local_git_push(
+async def local_git_push(
     remote: str = "origin", branch: str = "main", path: str = "."
 ) -> str:
     """
@@ -110,20 +125,26 @@ def local_git_push(
         branch: Branch name (default: "main").
         path: Path to the repo (default: current directory).
     """
-    result = orchestrator.git_push(Path(path), remote, branch)
+    result = await _get().git_push_async(path, remote, branch)
     if result["success"]:
         return result["stdout"] or "Push successful."
     return f"Error pushing to {remote}/{branch}: {result['stderr']}"
 
 
+# Tools that only inspect the repo and may run alongside each other.
+READ_ONLY_GIT_TOOLS = frozenset({"local_git_status", "local_git_log"})
+
+_GIT_TOOLS = (
+    local_git_init,
+    local_git_status,
+    local_git_add,
+    local_git_commit,
+    local_git_log,
+    local_git_remote_add,
+    local_git_push,
+)
+
+
 def get_git_tools() -> list:
     """Return a list of all git tools."""
-    return [
-        local_git_init,
-        local_git_status,
-        local_git_add,
-        local_git_commit,
-        local_git_log,
-        local_git_remote_add,
-        local_git_push,
-    ]
+    return list(_GIT_TOOLS)
@@ -1,16 +1,31 @@
 """
-GitBot terminal UI helpers using Rich and Pyfiglet.
+GitBot terminal UI helpers using Rich.
 """
 
-import json
-import pyfiglet
-from rich.console import Console
-from rich.markdown import Markdown
+import functools
+from contextlib import contextmanager
+
+import orjson
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
-from rich.syntax import Syntax
+from rich.rule import Rule
+from rich.style import Style
 from rich.text import Text
 from rich.theme import Theme
 
+from gitbot.core.config import TRUNCATION_MARKER
+
+# pyfiglet.figlet_format("GitBot", font="slant"), rendered ahead of time since
+# the output never changes.
+_BANNER = r"""
+   _______ __  ____        __ 
+  / ____(_) /_/ __ )____  / /_
+ / / __/ / __/ __  / __ \/ __/
+/ /_/ / / /_/ /_/ / /_/ / /_  
+\____/_/\__/_____/\____/\__/  
+                              """[1:]
+
 custom_theme = Theme(
     {
         "info": "cyan",
@@ -22,43 +37,160 @@ custom_theme = Theme(
     }
 )
 
-console = Console(theme=custom_theme)
+
+class BufferedConsole(Console):
+    """
+    Console that can collect renderables and print them in one go.
+
+    Each print re-renders and writes out separately, so helpers that show
+    several pieces queue them with write() and emit one Group with writeln().
+    Inside a buffered() block, writeln() keeps queueing and the whole block
+    is printed on exit.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._line_buffer: list = []
+        self._buffer_depth = 0
+
+    def write(self, *renderables):
+        """Queue renderables for the next flush."""
+        self._line_buffer.extend(renderables)
+
+    def writeln(self, *renderables):
+        """Queue renderables, then print everything queued unless buffering."""
+        self.write(*renderables)
+        if not self._buffer_depth:
+            self._flush_lines()
+
+    def _flush_lines(self):
+        if self._line_buffer:
+            buffer, self._line_buffer = self._line_buffer, []
+            super().print(Group(*buffer))
+
+    @contextmanager
+    def buffered(self):
+        """Hold back writeln() output until the block ends."""
+        self._buffer_depth += 1
+        try:
+            yield
+        finally:
+            self._buffer_depth -= 1
+            if not self._buffer_depth:
+                self._flush_lines()
+
+
+console = BufferedConsole(theme=custom_theme)
 
 
 def print_banner():
     """Display the GitBot ASCII art banner."""
-    ascii_art = pyfiglet.figlet_format("GitBot", font="slant")
-    console.print(f"[bold cyan]{ascii_art}[/bold cyan]", end="")
-    console.print("[muted]  Your AI-powered Git & GitHub assistant[/muted]\n")
-    console.rule(style="cyan")
-    console.print()
+    console.writeln(
+        f"[bold cyan]{_BANNER}[/bold cyan]",
+        "[muted]  Your AI-powered Git & GitHub assistant[/muted]\n",
+        Rule(style="cyan"),
+        "",
+    )
 
 
 def print_step(step_num: int, title: str):
     """Print a numbered onboarding step header."""
     console.print(
-        f"\n[heading]  Step {step_num}[/heading]  [bold white]{title}[/bold white]\n"
+        Text.assemble(
+            "\n", (f"  Step {step_num}", "heading"), "  ", (title, "bold white"), "\n"
+        )
+    )
+
+
+def print_success(message: str | Text):
+    """Print a success message. Plain strings are shown as-is, not as markup."""
+    console.print(Text.assemble("  ", ("✔", "success"), "  ", message))
+
+
+def print_error(message: str | Text):
+    """Print an error message. Plain strings are shown as-is, not as markup."""
+    console.writeln(
+        Panel(Text.assemble("✖  ", message, style="error"), border_style="red")
     )
 
 
-def print_success(message: str):
-    """Print a success message."""
-    console.print(f"  [success]✔[/success]  {message}")
+# Panel titles, parsed once instead of on every render.
+_TOOL_CALL_TITLE = Text.from_markup("[bold yellow]🔧 Tool Call:[/bold yellow] ")
+_TOOL_RESULT_TITLE = Text.from_markup("[bold green]📦 Tool Result[/bold green]")
+_RESULT_DISPLAY_LIMIT = 2000
+_RESPONSE_TITLE = Text.from_markup("[bold cyan]🤖 GitBot[/bold cyan]")
+
+# Monokai token styles, matching what Syntax(..., theme="monokai") produces.
+_JSON_BASE = Style.parse("on #272822")
+_JSON_PUNCT = Style.parse("not bold not italic not underline #f8f8f2 on #272822")
+_JSON_KEY = Style.parse("not bold not italic not underline #ff4689 on #272822")
+_JSON_STRING = Style.parse("not bold not italic not underline #e6db74 on #272822")
+_JSON_NUMBER = Style.parse("not bold not italic not underline #ae81ff on #272822")
+_JSON_KEYWORD = Style.parse("not bold not italic not underline #66d9ef on #272822")
+
 
+def _fast_json_text(args: dict) -> Text | None:
+    """
+    Highlight a small, flat argument dict without Pygments.
 
-def print_error(message: str):
-    """Print an error message."""
-    console.print(Panel(f"[error]✖  {message}[/error]", border_style="red"))
+    Covers the common case of a few scalar arguments; returns None for
+    anything else so the caller falls back to the full lexer.
+    """
+    if len(args) > 5:
+        return None
+
+    text = Text(style=_JSON_BASE, justify="left", no_wrap=True, tab_size=4)
+    if not args:
+        text.append("{}", _JSON_PUNCT)
+        return text
+
+    text.append("{", _JSON_PUNCT)
+    for i, (key, value) in enumerate(args.items()):
+        if isinstance(value, str):
+            style = _JSON_STRING
+        elif value is None or isinstance(value, bool):
+            style = _JSON_KEYWORD
+        elif isinstance(value, (int, float)):
+            style = _JSON_NUMBER
+        else:
+            return None
+        if i:
+            text.append(",", _JSON_PUNCT)
+        text.append("\n  ", _JSON_PUNCT)
+        text.append(orjson.dumps(key).decode(), _JSON_KEY)
+        text.append(":", _JSON_PUNCT)
+        text.append(" ", _JSON_PUNCT)
+        text.append(orjson.dumps(value).decode(), style)
+    text.append("\n", _JSON_PUNCT)
+    text.append("}", _JSON_PUNCT)
+    return text
+
+
+@functools.lru_cache(maxsize=128)
+def _highlight_args(args_str: str) -> Text:
+    """
+    Highlight tool arguments as JSON.
+
+    Syntax re-runs the Pygments lexer on every render, and agents repeat the
+    same calls turn after turn, so the highlighted Text is kept instead.
+    """
+    from rich.syntax import Syntax
+
+    syntax = Syntax(args_str, "json", theme="monokai", line_numbers=False)
+    text = syntax.highlight(args_str)
+    text.rstrip()
+    return text
 
 
 def print_tool_call(name: str, args: dict):
     """Show a tool call in a styled panel."""
-    args_str = json.dumps(args, indent=2)
-    syntax = Syntax(args_str, "json", theme="monokai", line_numbers=False)
-    console.print(
+    body = _fast_json_text(args)
+    if body is None:
+        body = _highlight_args(orjson.dumps(args, option=orjson.OPT_INDENT_2).decode())
+    console.writeln(
         Panel(
-            syntax,
-            title=f"[bold yellow]🔧 Tool Call:[/bold yellow] [white]{name}[/white]",
+            body,
+            title=_TOOL_CALL_TITLE + Text(name, style="white"),
             border_style="yellow",
             padding=(0, 1),
         )
@@ -67,29 +199,69 @@ def print_tool_call(name: str, args: dict):
 
 def print_tool_result(result: str):
     """Show a tool result in a styled panel."""
-    display = result if len(result) < 2000 else result[:2000] + "\n… (truncated)"
-    console.print(
+    if len(result) > _RESULT_DISPLAY_LIMIT:
+        result = result[:_RESULT_DISPLAY_LIMIT] + TRUNCATION_MARKER
+    console.writeln(
         Panel(
-            display,
-            title="[bold green]📦 Tool Result[/bold green]",
+            result,
+            title=_TOOL_RESULT_TITLE,
             border_style="green",
             padding=(0, 1),
         )
     )
 
 
-def print_response(text: str):
-    """Render an LLM response as markdown."""
-    console.print()
-    console.print(
-        Panel(
-            Markdown(text),
-            title="[bold cyan]🤖 GitBot[/bold cyan]",
-            border_style="cyan",
-            padding=(1, 2),
-        )
+def _response_panel(text: str) -> Panel:
+    from rich.markdown import Markdown
+
+    return Panel(
+        Markdown(text),
+        title=_RESPONSE_TITLE,
+        border_style="cyan",
+        padding=(1, 2),
     )
-    console.print()
+
+
+@contextmanager
+def stream_response():
+    """
+    Show the 'thinking' spinner until the first streamed text arrives, then
+    live-render the response panel as it grows.
+
+    Yields an update(text) callback taking the full text so far. The
+    markdown is only re-parsed on Live's refresh ticks, not per token.
+    While streaming, the panel is cropped to the terminal height (Live can't
+    redraw above the top row); the full reply is printed once at the end.
+    """
+    status = print_thinking()
+    live = None
+    current = ""
+
+    def update(text: str):
+        nonlocal live, current
+        current = text
+        if live is None:
+            status.stop()
+            console.print()
+            live = Live(
+                console=console,
+                get_renderable=lambda: _response_panel(current),
+                refresh_per_second=10,
+                vertical_overflow="ellipsis",
+                transient=True,
+            )
+            live.start()
+
+    status.start()
+    try:
+        yield update
+    finally:
+        if live is None:
+            status.stop()
+        else:
+            live.stop()
+            console.print(_response_panel(current))
+            console.print()
 
 
 def print_thinking():
@@ -99,9 +271,10 @@ def print_thinking():
 
 def print_welcome_back(username: str):
     """Print a welcome-back message for returning users."""
-    console.print(f"\n[success]👋 Welcome back, [bold]{username}[/bold]![/success]\n")
-    console.print(
-        "[muted]Type your message to interact with GitHub, or 'exit' to quit.[/muted]\n"
+    console.writeln(
+        f"\n[success]👋 Welcome back, [bold]{username}[/bold]![/success]\n",
+        "[muted]Type your message to interact with GitHub, '/refresh' to drop cached "
+        "GitHub results, or 'exit' to quit.[/muted]\n",
+        Rule(style="cyan"),
+        "",
     )
-    console.rule(style="cyan")
-    console.print()
@@ -0,0 +1,197 @@
+import asyncio
+import unittest
+
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
+
+from gitbot.core.agent import (
+    _ToolRunner,
+    _completed_tool_calls,
+    _deserialize_messages,
+    _run_turn,
+    _window_start,
+)
+from gitbot.mcp.client import MCP_RETRIEVE_TOOL, MCPToolIndex
+
+
+def _ai_call(*ids):
+    return {
+        "type": "ai",
+        "content": "",
+        "tool_calls": [{"name": "local_git_status", "args": {}, "id": i} for i in ids],
+    }
+
+
+def _tool(tool_call_id):
+    return {"type": "tool", "content": "ok", "tool_call_id": tool_call_id}
+
+
+class TestDeserializeMessages(unittest.TestCase):
+    def test_drops_unanswered_tool_calls_and_orphan_results(self):
+        data = [
+            _tool("0"),
+            {"type": "human", "content": "status?"},
+            _ai_call("1", "2"),
+            _tool("1"),
+            _tool("2"),
+            {"type": "ai", "content": "Clean."},
+            {"type": "human", "content": "push"},
+            _ai_call("3"),
+        ]
+        messages = _deserialize_messages(data)
+        self.assertEqual(
+            [m.type for m in messages], ["human", "ai", "tool", "tool", "ai", "human"]
+        )
+
+    def test_drops_partially_answered_tool_calls(self):
+        data = [{"type": "human", "content": "hi"}, _ai_call("1", "2"), _tool("1")]
+        self.assertEqual([m.type for m in _deserialize_messages(data)], ["human"])
+
+
+class TestWindowStart(unittest.TestCase):
+    def test_cuts_only_before_a_human_message(self):
+        types = ["human", "ai", "tool", "ai", "human", "ai", "tool", "tool", "ai"]
+        self.assertEqual(_window_start(types, 6), 4)
+        self.assertEqual(_window_start(types, 20), 0)
+
+    def test_keeps_a_turn_longer_than_the_limit_whole(self):
+        types = ["human", "ai", "human"] + ["ai", "tool"] * 10
+        self.assertEqual(_window_start(types, 5), 2)
+
+
+class _StubTool:
+    """Async tool stand-in that records when each call starts and finishes."""
+
+    def __init__(self, name, events):
+        self.name = name
+        self._events = events
+
+    async def ainvoke(self, args):
+        self._events.append(("start", args["id"]))
+        await asyncio.sleep(0.01)
+        self._events.append(("end", args["id"]))
+        return "ok"
+
+
+class TestToolRunner(unittest.TestCase):
+    def run_calls(self, names):
+        events = []
+        tools = {name: _StubTool(name, events) for name in set(names)}
+
+        async def main():
+            runner = _ToolRunner(tools, tool_index=None)
+            calls = [
+                {"name": name, "args": {"id": str(i)}, "id": str(i)}
+                for i, name in enumerate(names)
+            ]
+            return await runner.results(calls)
+
+        self.assertEqual(asyncio.run(main()), ["ok"] * len(names))
+        return events
+
+    def test_consecutive_reads_overlap(self):
+        events = self.run_calls(["local_git_status", "local_git_log"])
+        self.assertEqual(events[:2], [("start", "0"), ("start", "1")])
+
+    def test_read_after_write_waits_for_it(self):
+        events = self.run_calls(["local_git_add", "local_git_status"])
+        self.assertLess(events.index(("end", "0")), events.index(("start", "1")))
+
+    def test_write_waits_for_earlier_reads(self):
+        events = self.run_calls(
+            ["local_git_status", "local_git_log", "local_git_commit"]
+        )
+        commit_start = events.index(("start", "2"))
+        self.assertLess(events.index(("end", "0")), commit_start)
+        self.assertLess(events.index(("end", "1")), commit_start)
+
+
+class TestCompletedToolCalls(unittest.TestCase):
+    def chunk(self, args):
+        return AIMessageChunk(
+            content="",
+            tool_call_chunks=[
+                {"name": "local_git_log", "args": args, "id": "call_1", "index": 0}
+            ],
+        )
+
+    def test_partial_arguments_are_not_dispatched(self):
+        self.assertEqual(_completed_tool_calls(self.chunk('{"n": 1')), [])
+
+    def test_complete_arguments_are_dispatched(self):
+        self.assertEqual(
+            _completed_tool_calls(self.chunk('{"n": 1}')),
+            [{"name": "local_git_log", "args": {"n": 1}, "id": "call_1"}],
+        )
+
+
+class _StubLLM:
+    """Chat model stand-in that streams scripted replies, one per call."""
+
+    def __init__(self, replies):
+        self._replies = list(replies)
+        self.streamed_with = []  # Tool names bound for each streamed reply.
+
+    def bind_tools(self, tools):
+        names = [t["name"] if isinstance(t, dict) else t.name for t in tools]
+        return _StubBound(self, names)
+
+
+class _StubBound:
+    def __init__(self, llm, names):
+        self._llm = llm
+        self._names = names
+
+    async def astream(self, messages):
+        self._llm.streamed_with.append(self._names)
+        yield self._llm._replies.pop(0)
+        # Real streams await the network between chunks, which lets tool
+        # calls dispatched mid-stream run before the reply is complete.
+        await asyncio.sleep(0)
+
+
+class TestRunTurn(unittest.TestCase):
+    def test_streamed_retrieve_rebinds_selected_tools(self):
+        retrieve = AIMessageChunk(
+            content="",
+            tool_call_chunks=[
+                {
+                    "name": MCP_RETRIEVE_TOOL["name"],
+                    "args": '{"keywords": ["issue"]}',
+                    "id": "call_1",
+                    "index": 0,
+                }
+            ],
+        )
+        llm = _StubLLM([retrieve, AIMessageChunk(content="Done.")])
+        tool_index = MCPToolIndex(
+            [
+                {
+                    "name": "create_issue",
+                    "description": "Create a new issue",
+                    "parameters": {"type": "object", "properties": {}},
+                }
+            ]
+        )
+        base_tools = [MCP_RETRIEVE_TOOL]
+        messages = [HumanMessage(content="open an issue")]
+
+        asyncio.run(
+            _run_turn(
+                llm,
+                base_tools,
+                llm.bind_tools(base_tools),
+                SystemMessage(content=""),
+                messages,
+                lambda *msgs: messages.extend(msgs),
+                {},
+                tool_index,
+            )
+        )
+
+        self.assertEqual(llm.streamed_with[0], ["mcp_retrieve"])
+        self.assertEqual(llm.streamed_with[1], ["mcp_retrieve", "create_issue"])
+        self.assertEqual([m.type for m in messages], ["human", "ai", "tool", "ai"])
+
+
+if __name__ == "__main__":
+    unittest.main()
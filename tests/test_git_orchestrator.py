@@ -1,19 +1,29 @@
+import asyncio
 import unittest
 import shutil
 import tempfile
 import os
 import stat
+import subprocess
 from pathlib import Path
+from unittest import mock
 from gitbot.core.git_orchestrator import GitOrchestrator
 
 
 class TestGitOrchestrator(unittest.TestCase):
-    def setUp(self):
-        self.test_dir = tempfile.mkdtemp()
-        self.path = Path(self.test_dir)
-        self.orchestrator = GitOrchestrator()
+    @classmethod
+    def setUpClass(cls):
+        # One temp root for the whole class; each test works in its own subdir.
+        cls.test_dir = tempfile.mkdtemp()
+        cls.orchestrator = GitOrchestrator()
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.name == "posix":
+            # One native tree walk instead of Python-level unlinks per file.
+            subprocess.run(["rm", "-rf", cls.test_dir], check=False)
+            return
 
-    def tearDown(self):
         def onerror(func, path, exc_info):
             if not os.access(path, os.W_OK):
                 os.chmod(path, stat.S_IWRITE)
@@ -21,7 +31,11 @@ class TestGitOrchestrator(unittest.TestCase):
             else:
                 raise
 
-        shutil.rmtree(self.test_dir, onerror=onerror)
+        shutil.rmtree(cls.test_dir, onerror=onerror)
+
+    def setUp(self):
+        self.path = Path(self.test_dir) / self._testMethodName
+        self.path.mkdir()
 
     def test_init_and_status(self):
         # 1. Init
@@ -34,16 +48,30 @@ class TestGitOrchestrator(unittest.TestCase):
         self.assertTrue(status["success"])
         self.assertIn("On branch", status["stdout"])
 
+    def test_status_respects_max_bytes(self):
+        self.orchestrator.git_init(self.path)
+        for i in range(100):
+            (self.path / f"file{i}.txt").write_text("x")
+
+        for status in (
+            self.orchestrator.git_status(self.path, max_bytes=200),
+            asyncio.run(self.orchestrator.git_status_async(self.path, max_bytes=200)),
+        ):
+            self.assertTrue(status["success"])
+            self.assertTrue(status["stdout"].endswith("(truncated)"))
+            self.assertLess(len(status["stdout"]), 250)
+
+    def test_worktree_git_file_counts_as_repo(self):
+        self.assertFalse(self.orchestrator.is_git_initialized(self.path))
+        (self.path / ".git").write_text("gitdir: /elsewhere/.git/worktrees/wt\n")
+        self.assertTrue(self.orchestrator.is_git_initialized(self.path))
+
     def test_add_and_commit(self):
         self.orchestrator.git_init(self.path)
 
-        # Configure dummy git user for commits
-        self.orchestrator._run_git(
-            ["config", "--local", "user.email", "test@example.com"], cwd=self.path
-        )
-        self.orchestrator._run_git(
-            ["config", "--local", "user.name", "Test User"], cwd=self.path
-        )
+        # Configure dummy git user for commits, without spawning git config
+        with open(self.path / ".git" / "config", "a") as f:
+            f.write("[user]\n\temail = test@example.com\n\tname = Test User\n")
 
         # Create a file
         test_file = self.path / "test.txt"
@@ -62,6 +90,111 @@ class TestGitOrchestrator(unittest.TestCase):
         self.assertTrue(log_result["success"])
         self.assertIn("Initial commit", log_result["stdout"])
 
+        # 4. Log respects the commit limit
+        test_file.write_text("hello again")
+        self.orchestrator.git_add(self.path, ["."])
+        self.orchestrator.git_commit(self.path, "Second commit")
+        log_result = self.orchestrator.git_log(self.path, n=1)
+        self.assertTrue(log_result["success"])
+        self.assertEqual(len(log_result["stdout"].splitlines()), 1)
+
+    def test_log_cache_sees_outside_commits(self):
+        self.orchestrator.git_init(self.path)
+        identity = ["-c", "user.email=test@example.com", "-c", "user.name=Test"]
+
+        self.orchestrator._run_git(
+            identity + ["commit", "--allow-empty", "-m", "First"], cwd=self.path
+        )
+        self.assertIn("First", self.orchestrator.git_log(self.path)["stdout"])
+
+        # Committed behind the orchestrator's back, so only the ref stamps
+        # can invalidate the cached log.
+        self.orchestrator._run_git(
+            identity + ["commit", "--allow-empty", "-m", "Second"], cwd=self.path
+        )
+        self.assertIn("Second", self.orchestrator.git_log(self.path)["stdout"])
+
+        # Refs in nested or remote-tracking directories show up as decorations.
+        self.orchestrator._run_git(["branch", "feature/a"], cwd=self.path)
+        self.assertIn("feature/a", self.orchestrator.git_log(self.path)["stdout"])
+        self.orchestrator._run_git(["branch", "feature/b"], cwd=self.path)
+        self.orchestrator._run_git(
+            ["update-ref", "refs/remotes/origin/main", "HEAD"], cwd=self.path
+        )
+        log = self.orchestrator.git_log(self.path)["stdout"]
+        self.assertIn("feature/b", log)
+        self.assertIn("origin/main", log)
+
+    def test_run_batch_stops_at_first_failure(self):
+        self.orchestrator.git_init(self.path)
+        (self.path / "test.txt").write_text("hello world")
+
+        result = self.orchestrator._run_batch(
+            [
+                ["config", "--local", "user.email", "test@example.com"],
+                ["config", "--local", "user.name", "Test User"],
+                ["add", "."],
+                ["commit", "-m", "Batched commit"],
+            ],
+            cwd=self.path,
+        )
+        self.assertTrue(result["success"])
+        self.assertIn("Batched commit", self.orchestrator.git_log(self.path)["stdout"])
+
+        result = self.orchestrator._run_batch(
+            [["commit", "-m", "Nothing to commit"], ["tag", "never-created"]],
+            cwd=self.path,
+        )
+        self.assertFalse(result["success"])
+        self.assertEqual(
+            self.orchestrator._run_git(["tag"], cwd=self.path)["stdout"], ""
+        )
+
+    @unittest.skipUnless(os.name == "posix", "alias runs via sh")
+    def test_bounded_read_drains_large_stderr(self):
+        self.orchestrator.git_init(self.path)
+        # A shell alias writes well past a pipe's worth of stderr before any
+        # stdout; reading stderr only after stdout would deadlock here.
+        self.orchestrator._run_git(
+            ["config", "alias.noisy", "!head -c 200000 /dev/zero >&2; echo done"],
+            cwd=self.path,
+        )
+        result = self.orchestrator._run_git(["noisy"], cwd=self.path, max_bytes=100)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["stdout"].strip(), "done")
+        self.assertEqual(len(result["stderr"]), 200000)
+
+    def test_remote_add_rejects_duplicates(self):
+        self.orchestrator.git_init(self.path)
+
+        url = "https://github.com/example/repo.git"
+        result = self.orchestrator.git_remote_add(self.path, "origin", url)
+        self.assertTrue(result["success"])
+
+        result = self.orchestrator.git_remote_add(self.path, "origin", url)
+        self.assertFalse(result["success"])
+        self.assertEqual(result["stderr"], "Remote 'origin' already exists.")
+
+    def test_remote_add_rejects_duplicates_in_any_locale(self):
+        self.orchestrator.git_init(self.path)
+
+        url = "https://github.com/example/repo.git"
+        with mock.patch.dict(os.environ, {"LC_ALL": "de_DE.UTF-8"}):
+            asyncio.run(self.orchestrator.git_remote_add_async(self.path, "up", url))
+            result = asyncio.run(
+                self.orchestrator.git_remote_add_async(self.path, "up", url)
+            )
+        self.assertFalse(result["success"])
+        self.assertEqual(result["stderr"], "Remote 'up' already exists.")
+
+    def test_async_init_and_status(self):
+        result = asyncio.run(self.orchestrator.git_init_async(self.path))
+        self.assertTrue(result["success"])
+
+        status = asyncio.run(self.orchestrator.git_status_async(self.path))
+        self.assertTrue(status["success"])
+        self.assertIn("On branch", status["stdout"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,25 @@
+import unittest
+from types import SimpleNamespace
+
+from gitbot.core.config import TRUNCATION_MARKER
+from gitbot.mcp.client import _result_text
+
+
+def _result(*texts):
+    return SimpleNamespace(content=[SimpleNamespace(text=t) for t in texts])
+
+
+class TestResultText(unittest.TestCase):
+    def test_exactly_max_chars_is_not_truncated(self):
+        self.assertEqual(_result_text(_result("a" * 10), 10), "a" * 10)
+        self.assertEqual(_result_text(_result("a" * 4, "b" * 5), 10), "aaaa\nbbbbb")
+
+    def test_one_char_over_is_truncated(self):
+        self.assertEqual(
+            _result_text(_result("a" * 4, "b" * 6), 10),
+            "aaaa\nbbbbb" + TRUNCATION_MARKER,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()